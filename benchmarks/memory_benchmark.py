@@ -0,0 +1,186 @@
+"""Memory benchmark of a long running session.
+
+Replays a recorded session (looped until enough frames have been
+dispatched) through an EventController whose providers crop and convert
+each frame, and reports the peak and steady-state RSS, with and without
+buffer pooling.
+
+    python benchmarks/memory_benchmark.py --video session.avi --hours 2
+    python benchmarks/memory_benchmark.py --hours 0.5 --no-pool
+"""
+import argparse
+import resource
+import statistics
+import sys
+
+import cv2
+import numpy as np
+
+from pytrackcontrol.event import EventController
+
+
+def rss():
+    """The current resident set size in MiB.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2 ** 20
+    except OSError:
+        return peak_rss()
+
+
+def peak_rss():
+    """The peak resident set size in MiB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB elsewhere
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+class ReplayController(EventController):
+
+    def __init__(self, frames, video=None, pool=True, **kwargs):
+        EventController.__init__(self, root_event_label='src', **kwargs)
+        self._frames = frames
+        self._video = video
+        self._pool = pool
+        self._allocations = 0
+
+    def allocate(self, shape, dtype='uint8'):
+        """A pooled buffer, or a fresh array when pooling is disabled.
+        """
+        if self._pool:
+            return self.buffer(shape, dtype)
+        self._allocations += 1
+        return np.empty(shape, dtype)
+
+    @property
+    def allocations(self):
+        if self._pool:
+            return self.buffer_pool.allocations
+        return self._allocations
+
+    def _read(self):
+        if self._video is None:
+            shape = (480, 640, 3)
+            rng = np.random.default_rng(0)
+            recorded = [rng.integers(0, 255, shape, dtype=np.uint8)
+                        for _ in range(8)]
+            for i in range(self._frames):
+                img = self.allocate(shape)
+                # copy, as a camera would deliver the frame into new memory
+                np.copyto(img, recorded[i % len(recorded)])
+                yield img
+            return
+
+        cap = cv2.VideoCapture(self._video)
+        try:
+            if not cap.isOpened():
+                raise ValueError(f"Cannot open video '{self._video}'.")
+
+            shape = (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                     int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), 3)
+            count = 0
+            rewound = False
+            img = None
+            while count < self._frames:
+                if img is None:
+                    img = self.allocate(shape)
+                ok, frame = cap.read(img)
+                if not ok:
+                    if rewound:
+                        raise ValueError(f"No frames could be read from "
+                                         f"'{self._video}'.")
+                    # loop the recording, reusing the unfilled buffer
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    rewound = True
+                    continue
+                count += 1
+                rewound = False
+                img = None
+                yield frame
+        finally:
+            cap.release()
+
+    @property
+    def _context(self):
+        return self._read()
+
+
+def run(frames, video=None, pool=True, samples=100):
+    if frames < 1:
+        raise ValueError(f"At least one frame is required ({frames}).")
+
+    controller = ReplayController(frames, video, pool)
+    alloc = controller.allocate
+
+    @controller.register('crop')
+    def crop(resolve, img):
+        h, w = img.shape[:2]
+        region = img[h // 4:3 * h // 4, w // 4:3 * w // 4]
+        dst = alloc(region.shape, img.dtype)
+        np.copyto(dst, region)
+        resolve(dst)
+
+    @controller.register('gray', dep='crop')
+    def gray(resolve, img):
+        dst = alloc(img.shape[:2], img.dtype)
+        resolve(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=dst))
+
+    @controller.register('mean', dep='gray')
+    def mean(resolve, img):
+        resolve(float(img.mean()))
+
+    rss_samples = []
+    interval = max(1, frames // samples)
+    count = 0
+
+    @controller.on('mean')
+    def sample(value):
+        nonlocal count
+        if count % interval == 0:
+            rss_samples.append(rss())
+        count += 1
+
+    controller.start()
+
+    # the second half of the run, once warmed up
+    warm = rss_samples[len(rss_samples) // 2:]
+    return {
+        'frames': frames,
+        'pool': pool,
+        'peak_rss_mib': peak_rss(),
+        'steady_rss_mib': statistics.median(warm),
+        'rss_growth_mib': warm[-1] - warm[0],
+        'allocations': controller.allocations,
+        'reuses': controller.buffer_pool.reuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--video', help='a recorded session to replay, '
+                        'synthetic frames are used otherwise')
+    parser.add_argument('--hours', type=float, default=1.0,
+                        help="hours' worth of frames to dispatch")
+    parser.add_argument('--fps', type=float, default=30,
+                        help='the frame rate of the session')
+    parser.add_argument('--no-pool', action='store_true',
+                        help='allocate fresh buffers every frame')
+    args = parser.parse_args()
+
+    frames = int(args.hours * 3600 * args.fps)
+    if frames < 1:
+        parser.error('--hours and --fps must give at least one frame')
+    try:
+        result = run(frames, args.video, pool=not args.no_pool)
+    except ValueError as e:
+        parser.error(str(e))
+    for k, v in result.items():
+        print(f'{k:>16}: {v:.1f}' if isinstance(v, float) else
+              f'{k:>16}: {v}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,2 @@
 from .track_event_controller import EventController, TrackEventController
+from .event import Profiler, BufferPool
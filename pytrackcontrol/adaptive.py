@@ -0,0 +1,97 @@
+class ResolutionController:
+    """Tunes the scale of the frames fed to providers to hold a target fps.
+
+    The measured frame time is smoothed and compared against the frame
+    budget (1 / target_fps). The scale steps down when frames are slower
+    than the budget by more than `hysteresis`, and steps up when they are
+    faster by more than `hysteresis`. After each change the scale is held
+    for `patience` frames so it does not oscillate.
+    """
+
+    def __init__(self, target_fps, min_scale=0.25, max_scale=1.0, step=0.1,
+                 hysteresis=0.15, patience=15, smoothing=0.2):
+        """
+
+        Parameters
+        ----------
+        target_fps: float
+            The frame rate to hold
+        min_scale: float, optional
+            The smallest scale of the original resolution
+        max_scale: float, optional
+            The largest scale of the original resolution
+        step: float, optional
+            The amount the scale changes by at a time
+        hysteresis: float, optional
+            The fraction of the frame budget frame times must deviate by
+            before the scale changes
+        patience: int, optional
+            The number of frames to wait after a change
+        smoothing: float, optional
+            The weight given to the latest frame time in the moving average
+        """
+        if target_fps <= 0:
+            raise ValueError(f"target_fps must be positive ({target_fps}).")
+
+        self._budget = 1 / target_fps
+        self._min_scale = min_scale
+        self._max_scale = max_scale
+        self._step = step
+        self._hysteresis = hysteresis
+        self._patience = patience
+        self._smoothing = smoothing
+        self._frame_time = None
+        self._wait = patience
+        self.scale = max_scale
+
+    @property
+    def frame_time(self):
+        """
+        Returns
+        -------
+        float or None
+            the smoothed frame time in seconds
+        """
+        return self._frame_time
+
+    def update(self, elapsed):
+        """Feed the time taken by the latest frame.
+
+        Parameters
+        ----------
+        elapsed: float
+            The time in seconds taken to process the frame
+
+        Returns
+        -------
+        float
+            the scale to use for the next frame
+        """
+        if self._frame_time is None:
+            self._frame_time = elapsed
+        else:
+            self._frame_time += self._smoothing * (elapsed - self._frame_time)
+
+        if self._wait > 0:
+            self._wait -= 1
+            return self.scale
+
+        scale = self.scale
+        if self._frame_time > self._budget * (1 + self._hysteresis):
+            scale = max(self._min_scale, self._snap(scale - self._step))
+        elif self._frame_time < self._budget * (1 - self._hysteresis):
+            scale = min(self._max_scale, self._snap(scale + self._step))
+
+        if scale != self.scale:
+            self.scale = scale
+            # measure afresh at the new resolution
+            self._frame_time = None
+            self._wait = self._patience
+
+        return self.scale
+
+    def _snap(self, scale):
+        """Round `scale` to a multiple of `step`, so repeated steps do not
+        accumulate floating point error.
+        """
+        return round(round(scale / self._step) * self._step, 6)
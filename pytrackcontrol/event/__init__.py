@@ -1,2 +1,4 @@
 from .event_emitter import EventEmitter
+from .profiler import Profiler
+from .buffer_pool import BufferPool
 from .event_controller import EventController
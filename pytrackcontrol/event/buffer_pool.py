@@ -0,0 +1,94 @@
+from collections import defaultdict
+
+
+def _empty(shape, dtype):
+    import numpy as np
+    return np.empty(shape, dtype=dtype)
+
+
+class BufferPool:
+    """Recycles frame and scratch buffers between frames.
+
+    Buffers acquired while a frame is dispatched are leased to that frame
+    and returned to the pool once the frame's providers and handlers have
+    all finished, so a buffer (or a view of it) must not be kept beyond the
+    frame it was acquired in. Copy anything that needs to live longer.
+    """
+
+    def __init__(self, max_free=4, allocator=None):
+        """
+
+        Parameters
+        ----------
+        max_free: int, optional
+            The number of idle buffers kept for each shape and dtype
+        allocator: Callable[[tuple[int], str], Any], optional
+            Allocates a new buffer, defaults to `numpy.empty`
+        """
+        self._free = defaultdict(list)
+        self._leased = []
+        self._max_free = max_free
+        self._allocator = allocator or _empty
+        self.allocations = 0
+        self.reuses = 0
+
+    def acquire(self, shape, dtype='uint8'):
+        """Lease an uninitialised buffer until the end of the current frame.
+
+        Parameters
+        ----------
+        shape: int or tuple[int]
+        dtype: str or dtype, optional
+
+        Returns
+        -------
+        Any
+            the buffer, a NumPy array by default
+        """
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        key = (shape, str(dtype))
+
+        free = self._free[key]
+        if free:
+            buf = free.pop()
+            self.reuses += 1
+        else:
+            buf = self._allocator(shape, dtype)
+            self.allocations += 1
+
+        self._leased.append((key, buf))
+        return buf
+
+    def release_all(self):
+        """Return the buffers leased to the current frame to the pool.
+        """
+        for key, buf in self._leased:
+            free = self._free[key]
+            if len(free) < self._max_free:
+                free.append(buf)
+        self._leased.clear()
+
+    def clear(self):
+        """Drop all idle buffers.
+        """
+        self._free.clear()
+
+    @property
+    def leased(self):
+        """
+        Returns
+        -------
+        int
+            the number of buffers leased to the current frame
+        """
+        return len(self._leased)
+
+    @property
+    def idle(self):
+        """
+        Returns
+        -------
+        int
+            the number of buffers waiting to be reused
+        """
+        return sum(len(free) for free in self._free.values())
@@ -0,0 +1,116 @@
+from collections import OrderedDict, namedtuple
+from hashlib import blake2b
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def fingerprint(value):
+    """A cheap hashable key identifying `value` by content.
+
+    Arrays (anything with `shape`, `dtype` and `tobytes`, e.g. NumPy) are
+    keyed on a digest of their bytes, containers recursively and everything
+    else by type and value (so 1, 1.0 and True differ). Objects hashed by
+    identity cannot be fingerprinted, as they may be mutated in place.
+
+    Returns
+    -------
+    Hashable or None
+        the key, or None if `value` cannot be fingerprinted
+    """
+    if hasattr(value, 'tobytes') and hasattr(value, 'shape'):
+        digest = blake2b(_buffer(value), digest_size=16).digest()
+        return ('array', value.shape, str(value.dtype), digest)
+
+    if isinstance(value, (list, tuple)):
+        keys = tuple(fingerprint(v) for v in value)
+        return None if None in keys else (type(value).__name__, keys)
+
+    if isinstance(value, dict):
+        keys = tuple((k, fingerprint(v)) for k, v in value.items())
+        return None if any(k[1] is None for k in keys) else ('dict', keys)
+
+    if value is not None and type(value).__hash__ is object.__hash__:
+        return None
+
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return (type(value), value)
+
+
+def _buffer(array):
+    """The bytes of `array`, without copying when it is C-contiguous.
+    """
+    try:
+        data = memoryview(array)
+    except (TypeError, ValueError):
+        # no buffer protocol, or a dtype it cannot express (e.g. datetime64)
+        return array.tobytes()
+    return data if data.c_contiguous else array.tobytes()
+
+
+class ProviderCache:
+    """A bounded LRU cache of the values resolved by a pure provider.
+    """
+
+    def __init__(self, maxsize=128, key=None):
+        """
+
+        Parameters
+        ----------
+        maxsize: int, optional
+            The number of input combinations remembered
+        key: Callable[[Any], Hashable], optional
+            Computes the key of a single input, defaults to `fingerprint`.
+            A coarser key (e.g. of a downsampled or quantized image) lets
+            nearly identical frames hit the cache.
+        """
+        self._cache = OrderedDict()
+        self._maxsize = maxsize
+        self._key = key or fingerprint
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, inputs):
+        """
+        Returns
+        -------
+        Hashable or None
+            the key of the provider inputs, or None if they cannot be cached
+        """
+        keys = tuple(self._key(i) for i in inputs)
+        return None if None in keys else keys
+
+    def get(self, key):
+        """
+        Returns
+        -------
+        list or None
+            the values resolved for `key`, or None on a miss
+        """
+        if key is None or key not in self._cache:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return self._cache[key]
+
+    def put(self, key, resolved):
+        if key is None:
+            return
+
+        self._cache[key] = resolved
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self._maxsize,
+                         len(self._cache))
@@ -1,20 +1,38 @@
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from copy import deepcopy
 from functools import wraps, partial
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
+from threading import Event, RLock
+from time import perf_counter
 
 from pytrackcontrol.event import EventEmitter
+from pytrackcontrol.event.buffer_pool import BufferPool
+from pytrackcontrol.event.cache import ProviderCache
 from pytrackcontrol.graph import Dag
 
+# weight given to the latest sample in the moving average of provider costs
+COST_SMOOTHING = 0.1
+
 
 class EventController(ABC, EventEmitter):
 
-    def __init__(self, root_event_label):
+    def __init__(self, root_event_label, profiler=None, buffer_pool=None,
+                 reorder_interval=None):
         """
 
         Parameters
         ----------
         root_event_label: str
             The name of the root/source event produced in the main loop
+        profiler: Profiler, optional
+            Records the timings of providers in each frame
+        buffer_pool: BufferPool, optional
+            Supplies the buffers returned by `buffer`
+        reorder_interval: int, optional
+            Enables ordering providers by their measured costs, so that the
+            costliest chains are started first, every `reorder_interval`
+            frames. By default providers keep their registration order.
         """
         EventEmitter.__init__(self)
         self._root_event_label = root_event_label
@@ -23,12 +41,28 @@ class EventController(ABC, EventEmitter):
         self._event_providers = {}
         self._provider_event_sequence = []
         self._event_sequence = []
+        self._provider_costs = {}
+        self._profiler = profiler
+        self._frame_index = 0
+        self._reorder_interval = reorder_interval
+        self._cost_ordered = bool(reorder_interval)
+        self._buffer_pool = buffer_pool or BufferPool()
+        # held while a frame is dispatched or the graph is reconfigured
+        self._lock = RLock()
+        self._reconfiguring = False
+        self._dispatching = False
+        # changes made by reconfigure during a frame, applied after it
+        self._staged = None
+        self._stopping = False
+        self._reload = False
+        self._resumed = Event()
+        self._resumed.set()
 
     def start(self):
         """Start the main loop.
 
         Emitted events in the registered providers will trigger the event
-        handler callbacks.
+        handler callbacks. Runs until the iterable ends or `stop` is called.
         """
         @contextmanager
         def running():
@@ -38,18 +72,85 @@ class EventController(ABC, EventEmitter):
             finally:
                 self._running = False
 
+        self._stopping = False
+
         with running():
-            self._refresh_providers()
+            with self._lock:
+                self._refresh_providers()
 
-            try:
-                with self._context as ctx:
-                    self._iterate(ctx)
-            except AttributeError:
-                self._iterate(self._context)
+            while not self._stopping:
+                self._reload = False
+
+                context = self._context
+                if hasattr(context, '__enter__'):
+                    with context as ctx:
+                        self._iterate(ctx)
+                else:
+                    self._iterate(context)
+
+                if not self._reload:
+                    break
+
+    def stop(self):
+        """Stop the main loop after the frame being dispatched.
+
+        Can be called from a handler, provider or another thread.
+        """
+        self._stopping = True
+        self._resumed.set()
+
+    def pause(self):
+        """Hold the main loop before the next frame until `resume` is called.
+
+        Providers and their state are kept, frames are not consumed while
+        paused.
+        """
+        self._resumed.clear()
+
+    def resume(self):
+        self._resumed.set()
+
+    @property
+    def paused(self):
+        return not self._resumed.is_set()
+
+    def reload_source(self):
+        """Close the current source and open `_context` again, without
+        restarting the main loop or the registered providers.
+
+        Subclasses call this after changing what `_context` returns.
+        """
+        if self._running:
+            self._reload = True
 
     def _iterate(self, iterable):
-        for item in iterable:
-            self._dispatch(item)
+        iterator = iter(iterable)
+        while True:
+            self._resumed.wait()
+            if self._stopping or self._reload:
+                return
+
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+
+            with self._lock:
+                self._dispatching = True
+                try:
+                    self._dispatch(item)
+                finally:
+                    self._dispatching = False
+                    # all providers and handlers of the frame have finished
+                    self._buffer_pool.release_all()
+
+                    if self._staged:
+                        staged, self._staged = self._staged, None
+                        self._apply_graph(staged)
+
+                if self._reorder_interval and \
+                   self._frame_index % self._reorder_interval == 0:
+                    self._refresh_providers()
 
     def _dispatch(self, value):
         """Dispatch the initial value to the registered handling functions.
@@ -58,26 +159,156 @@ class EventController(ABC, EventEmitter):
         to them when the dependency has been met.
         """
         outputs = {}
+        profiler = self._profiler
+        frame_index = self._frame_index
+        self._frame_index += 1
+        frame_start = perf_counter()
+        handler_time = 0.0  # spent in handlers by the current provider
 
         def resolver(event, value):
+            nonlocal handler_time
             outputs[event] = value
+            t = perf_counter()
             self.emit(event, value)
+            handler_time += perf_counter() - t
 
         resolver(self._root_event_label, value)
 
         for event in self._event_sequence[1:]:
-            provider = self._event_providers[event]
+            provider = self._event_providers.get(event)
+            if provider is None:
+                # unregistered since the frame started
+                continue
 
             try:
                 inputs = [outputs[dep] for dep in provider['dependencies']]
                 res = partial(resolver, event)
                 fn = provider['function']
-                fn(res, *inputs)
+                cache = provider['cache']
+                handler_time = 0.0
+                t = perf_counter()
+
+                if cache is None:
+                    fn(res, *inputs)
+                else:
+                    key = cache.key(inputs)
+                    resolved = cache.get(key)
+                    if resolved is None:
+                        resolved = []
+
+                        def res(value, event=event, resolved=resolved):
+                            resolved.append(value)
+                            resolver(event, value)
+
+                        fn(res, *inputs)
+                        cache.put(key, resolved)
+                    else:
+                        # replay the values resolved for the same inputs
+                        for v in resolved:
+                            res(v)
+
+                end = perf_counter()
+                self._record_cost(event, end - t - handler_time)
+                if profiler:
+                    profiler.record(event, frame_index, t, end)
             except KeyError as e:
                 # ignore if dependencies are not met
                 ...
                 # print(e)
 
+        if profiler:
+            profiler.record_frame(frame_index, frame_start, perf_counter())
+
+    def buffer(self, shape, dtype='uint8'):
+        """A pooled buffer for frame data or scratch space within providers.
+
+        The buffer is only valid until the current frame has been
+        dispatched, after which it is reused by later frames.
+
+        >>> @controller.register('gray')
+        >>> def gray(resolve, img):
+        >>>     dst = controller.buffer(img.shape[:2], img.dtype)
+        >>>     resolve(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=dst))
+
+        Parameters
+        ----------
+        shape: int or tuple[int]
+        dtype: str or dtype, optional
+
+        Returns
+        -------
+        numpy.ndarray
+            an uninitialised buffer
+        """
+        return self._buffer_pool.acquire(shape, dtype)
+
+    @property
+    def buffer_pool(self):
+        """
+        Returns
+        -------
+        BufferPool
+            the pool supplying `buffer`
+        """
+        return self._buffer_pool
+
+    @property
+    def cache_info(self):
+        """
+        Returns
+        -------
+        dict[str, CacheInfo]
+            the hits, misses, maxsize and currsize of each pure provider's
+            cache
+        """
+        return {e: p['cache'].info()
+                for e, p in self._event_providers.items()
+                if p['cache'] is not None}
+
+    def _record_cost(self, event, elapsed):
+        cost = self._provider_costs.get(event, elapsed)
+        self._provider_costs[event] = cost + COST_SMOOTHING * (elapsed - cost)
+
+    @property
+    def dag(self):
+        """
+        Returns
+        -------
+        Dag
+            the dependency graph of the registered providers
+        """
+        return self._dag
+
+    @property
+    def provider_costs(self):
+        """
+        Returns
+        -------
+        dict[str, float]
+            a moving average of the time in seconds taken by each provider,
+            excluding the handlers of its event (the cache lookup for pure
+            providers that hit their cache)
+        """
+        return dict(self._provider_costs)
+
+    def critical_path(self):
+        """The chain of providers which bounds the latency of a frame.
+
+        Returns
+        -------
+        tuple[list[str], float]
+            the events along the path and its total measured cost in seconds
+        """
+        return self._dag.critical_path(weights=self._provider_costs)
+
+    def reorder(self):
+        """Reorder the providers by their measured costs now. Later
+        refreshes of the providers keep ordering them by cost.
+        """
+        with self._lock:
+            self._cost_ordered = True
+            self._refresh_providers()
+
     def _refresh_handlers(self):
         """
         When a handler is added or removed, dependencies on providers may be
@@ -109,14 +340,78 @@ class EventController(ABC, EventEmitter):
         When a provider is added, cycles may be introduced or dependencies may
         need to be reolved in order to execute in the correct order.
         Updates the DAG and refreshes the event sequence.
+        When ordering by cost, the costliest chains measured so far are
+        started first.
         """
-        self._provider_event_sequence = self._dag.topological_sort()
+        weights = self._provider_costs if self._cost_ordered else None
+        self._provider_event_sequence = self._dag.topological_sort(
+            weights=weights)
         self._refresh_handlers()
 
     def _on_change(self):
-        if self._running:
+        if self._running and not self._reconfiguring:
             self._refresh_handlers()
 
+    @contextmanager
+    def reconfigure(self):
+        """Change providers and handlers atomically while running.
+
+        The changes are made to a copy of the graph and applied between
+        frames: from another thread, once the current frame has finished;
+        from a handler or provider, after the rest of the current frame has
+        been dispatched with the old graph. If an exception is raised the
+        changes are discarded. While running, single `register`,
+        `unregister`, `on` and `off` calls are applied the same way.
+
+        >>> with controller.reconfigure():
+        >>>     controller.unregister('gesture')
+        >>>     controller.register('gesture', new_gesture, dep='landmarks')
+        """
+        with self._lock:
+            if self._reconfiguring:
+                # nested, applied by the outermost block
+                yield self
+                return
+
+            live = self._graph_state()
+            providers, dag, handlers = self._staged or live
+            self._set_graph_state((
+                dict(providers),
+                deepcopy(dag),
+                defaultdict(list, {e: list(h) for e, h in handlers.items()})
+            ))
+            self._reconfiguring = True
+            try:
+                yield self
+                staged = self._graph_state()
+            finally:
+                self._reconfiguring = False
+                self._set_graph_state(live)
+
+            if self._dispatching:
+                self._staged = staged
+            else:
+                self._apply_graph(staged)
+
+    def _changing(self):
+        """While running, changes to providers and handlers are made
+        through `reconfigure`, so they are applied between frames.
+        """
+        return self.reconfigure() if self._running else nullcontext()
+
+    def _graph_state(self):
+        return self._event_providers, self._dag, self._event_handlers
+
+    def _set_graph_state(self, state):
+        self._event_providers, self._dag, self._event_handlers = state
+
+    def _apply_graph(self, state):
+        self._set_graph_state(state)
+        self._provider_costs = {e: c for e, c in self._provider_costs.items()
+                                if e in self._event_providers}
+        if self._running:
+            self._refresh_providers()
+
     @property
     @abstractmethod
     def _context(self):
@@ -130,7 +425,8 @@ class EventController(ABC, EventEmitter):
         """
         pass
 
-    def register(self, event, fn=None, dep=None):
+    def register(self, event, fn=None, dep=None, pure=False, cache_size=128,
+                 cache_key=None):
         """
 
         Parameters
@@ -144,6 +440,16 @@ class EventController(ABC, EventEmitter):
         dep: str or list[str]
             The dependencies that must be resolved beforehand and be supplied
             to `fn`.
+        pure: bool, optional
+            If `fn` depends only on its inputs, the values it resolves are
+            cached and replayed, without calling `fn`, when the same inputs
+            are seen again. Cached values are shared so must not be mutated
+            (nor be pooled buffers, which are reused by later frames).
+        cache_size: int, optional
+            The number of input combinations cached for a pure provider
+        cache_key: Callable[[Any], Hashable], optional
+            Computes the cache key of each input, defaults to
+            `pytrackcontrol.event.cache.fingerprint`
 
         Raises
         ------
@@ -152,31 +458,31 @@ class EventController(ABC, EventEmitter):
         """
 
         def _register(fn, dep):
-            if event in self._event_providers:
-                raise ValueError(f"A provider is already registered for"
-                                 "this event ({event}).")
+            with self._changing():
+                if event in self._event_providers:
+                    raise ValueError(f"A provider is already registered for"
+                                     "this event ({event}).")
 
-            if not dep:
-                dep = self._root_event_label
+                if not dep:
+                    dep = self._root_event_label
 
-            if isinstance(dep, str):
-                dep = [dep]
+                if isinstance(dep, str):
+                    dep = [dep]
 
-            for d in dep:
-                if d != self._root_event_label and \
-                   d not in self._event_providers.keys():
-                    raise ValueError(f"dependency '{d}' does not exist.")
+                for d in dep:
+                    if d != self._root_event_label and \
+                       d not in self._event_providers.keys():
+                        raise ValueError(f"dependency '{d}' does not exist.")
 
-            self._event_providers[event] = {
-                'function': fn,
-                'dependencies': dep
-            }
+                cache = ProviderCache(cache_size, cache_key) if pure else None
+                self._event_providers[event] = {
+                    'function': fn,
+                    'dependencies': dep,
+                    'cache': cache
+                }
 
-            for d in dep:
-                self._dag.add_edge(d, event)
-
-            if self._running:
-                self._refresh_providers()
+                for d in dep:
+                    self._dag.add_edge(d, event)
 
         if fn:
             # normal usage
@@ -192,3 +498,34 @@ class EventController(ABC, EventEmitter):
                 _register(wrapper, dep)
                 return wrapper
             return decorator
+
+    def unregister(self, event):
+        """Removes the provider of `event`.
+
+        Parameters
+        ----------
+        event: str
+            The event name
+
+        Raises
+        ------
+        ValueError:
+            if no provider is registered for `event` or other providers
+            depend on it
+        """
+        with self._changing():
+            if event not in self._event_providers:
+                raise ValueError(f"No provider is registered for this event "
+                                 f"({event}).")
+
+            dependants = [e for e, p in self._event_providers.items()
+                          if event in p['dependencies']]
+            if dependants:
+                raise ValueError(f"'{event}' is a dependency of "
+                                 f"{dependants}.")
+
+            del self._event_providers[event]
+            self._dag.remove_vertex(event)
+
+            if not self._reconfiguring:
+                self._provider_costs.pop(event, None)
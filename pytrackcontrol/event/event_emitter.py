@@ -1,4 +1,5 @@
 from collections import defaultdict
+from contextlib import nullcontext
 from functools import wraps
 
 
@@ -45,8 +46,9 @@ class EventEmitter:
         """
 
         def _on(callback):
-            self._event_handlers[event].append(callback)
-            self._on_change()
+            with self._changing():
+                self._event_handlers[event].append(callback)
+                self._on_change()
 
         if callback:
             # normal usage
@@ -76,15 +78,16 @@ class EventEmitter:
         callback: Callable[[Any], None], optional
             The event handler to remove
         """
-        if callback:
-            self._event_handlers[event].remove(callback)
-            # return if there are still handlers attached
+        with self._changing():
+            if callback:
+                self._event_handlers[event].remove(callback)
+                # return if there are still handlers attached
 
-        # otherwise delete the event
-        if not callback or not self._event_handlers[event]:
-            del self._event_handlers[event]
+            # otherwise delete the event
+            if not callback or not self._event_handlers[event]:
+                del self._event_handlers[event]
 
-        self._on_change()
+            self._on_change()
 
     def emit(self, event, value):
         """Triggers handlers attached to `event` with `value` as a parameter.
@@ -103,3 +106,8 @@ class EventEmitter:
         """Optional hook to be notified of a change
         """
         pass
+
+    def _changing(self):
+        """Optional hook returning a context manager which wraps a change
+        """
+        return nullcontext()
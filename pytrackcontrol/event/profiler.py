@@ -0,0 +1,125 @@
+import json
+import os
+from collections import deque
+from threading import get_ident
+from time import perf_counter
+
+
+class Profiler:
+    """Records provider timings per frame into a fixed-size ring buffer.
+
+    Recording is an append of a tuple, cheap enough to leave enabled. The
+    buffer can be exported in the Chrome trace-event format (viewable in
+    chrome://tracing or Perfetto) on demand or when a frame is slow.
+
+    >>> def on_slow_frame(profiler, frame, duration):
+    >>>     profiler.dump(f'slow_frame_{frame}.json')
+
+    >>> profiler = Profiler(slow_frame=0.1, on_slow_frame=on_slow_frame)
+    >>> controller = TrackEventController(profiler=profiler)
+    """
+
+    def __init__(self, capacity=10000, slow_frame=None, on_slow_frame=None):
+        """
+
+        Parameters
+        ----------
+        capacity: int, optional
+            The number of spans kept, older spans are discarded
+        slow_frame: float, optional
+            The duration in seconds above which a frame is considered slow
+        on_slow_frame: Callable[[Profiler, int, float], None], optional
+            Called with the profiler, frame index and duration of slow frames
+        """
+        self._spans = deque(maxlen=capacity)
+        self._slow_frame = slow_frame
+        self._on_slow_frame = on_slow_frame
+        self._origin = perf_counter()
+
+    def record(self, name, frame, start, end):
+        """Record a span, timestamps are from `time.perf_counter`.
+
+        Parameters
+        ----------
+        name: str
+            The name of the span, usually the provider event
+        frame: int
+            The index of the frame the span belongs to
+        start: float
+        end: float
+        """
+        self._spans.append(('provider', name, frame, start, end, get_ident()))
+
+    def record_frame(self, frame, start, end):
+        """Record the span of a whole frame and trigger `on_slow_frame` if
+        it exceeded the `slow_frame` threshold.
+        """
+        self._spans.append(('frame', 'frame', frame, start, end,
+                            get_ident()))
+
+        duration = end - start
+        if self._slow_frame is not None and duration > self._slow_frame:
+            if self._on_slow_frame:
+                self._on_slow_frame(self, frame, duration)
+
+    def clear(self):
+        self._spans.clear()
+
+    def trace_events(self, frames=None):
+        """
+        Parameters
+        ----------
+        frames: Iterable[int], optional
+            Only include spans of these frames
+
+        Returns
+        -------
+        list[dict]
+            the recorded spans as Chrome complete ('X') trace events
+        """
+        if frames is not None:
+            frames = set(frames)
+
+        pid = os.getpid()
+        return [
+            {
+                'name': name,
+                'cat': cat,
+                'ph': 'X',
+                'ts': (start - self._origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': pid,
+                'tid': tid,
+                'args': {'frame': frame},
+            }
+            for cat, name, frame, start, end, tid in list(self._spans)
+            if frames is None or frame in frames
+        ]
+
+    def dump(self, file=None, frames=None):
+        """Export the recorded spans as Chrome trace-event JSON.
+
+        Parameters
+        ----------
+        file: str or TextIO, optional
+            A path or file object to write to
+        frames: Iterable[int], optional
+            Only include spans of these frames
+
+        Returns
+        -------
+        dict
+            the trace
+        """
+        trace = {
+            'traceEvents': self.trace_events(frames),
+            'displayTimeUnit': 'ms',
+        }
+
+        if isinstance(file, str):
+            with open(file, 'w') as f:
+                json.dump(trace, f)
+        elif file is not None:
+            json.dump(trace, file)
+
+        return trace
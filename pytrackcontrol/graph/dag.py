@@ -1,4 +1,5 @@
 from collections import defaultdict, deque
+from heapq import heappush, heappop
 
 
 class Dag:
@@ -25,7 +26,46 @@ class Dag:
 
         self._graph[u].append(v)
 
-    def topological_sort(self):
+    def remove_vertex(self, v):
+        """Remove vertex v and its edges from the dag.
+
+        Raises
+        ------
+        ValueError:
+            if `v` is not in the graph or is the root
+        """
+        if v not in self._vertices:
+            raise ValueError(f"vertex '{v}' does not exist.")
+        if v == self._root:
+            raise ValueError("The root cannot be removed.")
+
+        self._vertices.remove(v)
+        self._graph.pop(v, None)
+        for u_dependants in self._graph.values():
+            while v in u_dependants:
+                u_dependants.remove(v)
+
+    def topological_sort(self, weights=None):
+        """Order the vertices so that every vertex comes after its parents.
+
+        Parameters
+        ----------
+        weights: dict[str, float], optional
+            The cost of each vertex (missing vertices cost 0). When supplied,
+            of the vertices that are ready the one heading the costliest
+            remaining chain comes first, so the critical path is started as
+            early as possible.
+
+        Returns
+        -------
+        list[str]
+            the topological ordering
+
+        Raises
+        ------
+        ValueError:
+            if the graph contains cycles
+        """
         # get indegree of each vertex
         indegree = {u: 0 for u in self._vertices}
         for u_dependants in self._graph.values():
@@ -34,25 +74,45 @@ class Dag:
 
         if self._root:
             # we already know there is a single vertex with indegree of 0
-            queue = deque([self._root])
+            sources = [self._root]
         else:
             # add all vertices with indegree of 0
-            queue = deque([v for v, deg in indegree.items() if deg == 0])
+            sources = [v for v, deg in indegree.items() if deg == 0]
+
+        if weights:
+            priority = self._bottom_levels(weights)
+            heap = []
+            seq = 0   # tie breaker, keeps insertion order for equal costs
+
+            def push(v):
+                nonlocal seq
+                heappush(heap, (-priority[v], seq, v))
+                seq += 1
+
+            def pop():
+                return heappop(heap)[2]
+        else:
+            heap = deque()
+            push = heap.append
+            pop = heap.popleft
+
+        for v in sources:
+            push(v)
 
         count = 0   # vertices visited
 
         ordering = []   # topological ordering
 
-        while queue:
+        while heap:
 
-            u = queue.popleft()
+            u = pop()
             ordering.append(u)
 
             for v in self._graph[u]:
                 indegree[v] -= 1
 
                 if indegree[v] == 0:
-                    queue.append(v)
+                    push(v)
 
             count += 1
 
@@ -60,3 +120,192 @@ class Dag:
             raise ValueError("Graph contains cycles")
 
         return ordering
+
+    def levels(self):
+        """Decompose the graph into levels.
+
+        A vertex is placed one level below the deepest of its parents, so the
+        vertices within a level do not depend on each other.
+
+        Returns
+        -------
+        list[list[str]]
+            the vertices of each level, starting with the sources
+        """
+        level = {}
+        for u in self.topological_sort():
+            level.setdefault(u, 0)
+            for v in self._graph[u]:
+                level[v] = max(level.get(v, 0), level[u] + 1)
+
+        levels = [[] for _ in range(max(level.values(), default=-1) + 1)]
+        for v, i in level.items():
+            levels[i].append(v)
+        return levels
+
+    def critical_path(self, weights=None):
+        """Find the longest (costliest) path through the graph.
+
+        Parameters
+        ----------
+        weights: dict[str, float], optional
+            The cost of each vertex (missing vertices cost 0). By default each
+            vertex costs 1, i.e. the path with the most vertices is found.
+
+        Returns
+        -------
+        tuple[list[str], float]
+            the vertices along the path and its total cost
+        """
+        if weights is None:
+            weights = {v: 1 for v in self._vertices}
+
+        predecessors = self._predecessors()
+        cost = {}
+        previous = {}
+        for v in self.topological_sort():
+            parent = max(predecessors[v], key=cost.get, default=None)
+            cost[v] = weights.get(v, 0)
+            if parent is not None:
+                cost[v] += cost[parent]
+                previous[v] = parent
+
+        if not cost:
+            return [], 0
+
+        v = max(cost, key=cost.get)
+        total = cost[v]
+        path = [v]
+        while v in previous:
+            v = previous[v]
+            path.append(v)
+        return path[::-1], total
+
+    def ancestors(self, v):
+        """
+        Returns
+        -------
+        set[str]
+            the vertices from which `v` can be reached
+
+        Raises
+        ------
+        ValueError:
+            if `v` is not in the graph
+        """
+        return self._reachable(v, self._predecessors())
+
+    def descendants(self, v):
+        """
+        Returns
+        -------
+        set[str]
+            the vertices which can be reached from `v`
+
+        Raises
+        ------
+        ValueError:
+            if `v` is not in the graph
+        """
+        return self._reachable(v, self._graph)
+
+    def transitive_reduction(self):
+        """Remove the edges which are implied by a longer path.
+
+        Returns
+        -------
+        Dag
+            a new graph with the same vertices and reachability but the fewest
+            edges
+        """
+        reduced = Dag(root=self._root)
+        reduced._vertices = set(self._vertices)
+
+        for u in self.topological_sort():
+            children = list(dict.fromkeys(self._graph[u]))
+            implied = set()
+            for v in children:
+                implied |= self.descendants(v)
+            for v in children:
+                if v not in implied:
+                    reduced.add_edge(u, v)
+
+        return reduced
+
+    def to_dot(self, weights=None, name='dag'):
+        """Export the graph in the Graphviz DOT language.
+
+        Parameters
+        ----------
+        weights: dict[str, float], optional
+            The cost of each vertex. When supplied, costs are added to the
+            labels and the critical path is highlighted.
+        name: str, optional
+            The name of the graph
+
+        Returns
+        -------
+        str
+            the DOT source
+        """
+        ordering = self.topological_sort()
+        critical = set()
+        if weights:
+            path, _ = self.critical_path(weights)
+            critical = set(zip(path, path[1:]))
+
+        lines = [f'digraph {_quote(name)} {{']
+        for v in ordering:
+            if weights:
+                label = f'{_escape(v)}\\n{weights.get(v, 0):.3g}'
+                lines.append(f'    {_quote(v)} [label="{label}"];')
+            else:
+                lines.append(f'    {_quote(v)};')
+        for u in ordering:
+            for v in dict.fromkeys(self._graph[u]):
+                edge = f'{_quote(u)} -> {_quote(v)}'
+                if (u, v) in critical:
+                    lines.append(f'    {edge} [color=red, penwidth=2];')
+                else:
+                    lines.append(f'    {edge};')
+        lines.append('}')
+        return '\n'.join(lines)
+
+    def _bottom_levels(self, weights):
+        """The cost of the costliest path starting at each vertex.
+        """
+        bottom = {}
+        for u in reversed(self.topological_sort()):
+            bottom[u] = weights.get(u, 0) + max(
+                (bottom[v] for v in self._graph[u]), default=0)
+        return bottom
+
+    def _predecessors(self):
+        predecessors = defaultdict(list)
+        for u, u_dependants in self._graph.items():
+            for v in u_dependants:
+                predecessors[v].append(u)
+        return predecessors
+
+    def _reachable(self, v, graph):
+        if v not in self._vertices:
+            raise ValueError(f"vertex '{v}' does not exist.")
+
+        seen = set()
+        queue = deque(graph.get(v, ()))
+        while queue:
+            u = queue.popleft()
+            if u not in seen:
+                seen.add(u)
+                queue.extend(graph.get(u, ()))
+        return seen
+
+
+def _escape(s):
+    return str(s).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _quote(s):
+    """Quote `s` as a DOT identifier.
+    """
+    return f'"{_escape(s)}"'
@@ -17,7 +17,15 @@ class FaceBBoxProvider:
     def __init__(self):
         self._face_tracker = FaceTracker()
 
-    def provide(self, resolve, img):
+    def provide(self, resolve, img, scale=(1.0, 1.0)):
+        """Resolves the face bounding box (x, y, w, h), in the original
+        resolution when registered with `dep=['src', 'scale']`.
+        """
         bbox = self._face_tracker.track(img)
         if bbox:
+            sx, sy = scale
+            if (sx, sy) != (1.0, 1.0):
+                x, y, w, h = bbox
+                bbox = (int(round(x / sx)), int(round(y / sy)),
+                        int(round(w / sx)), int(round(h / sy)))
             resolve(bbox)
@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from pytrackcontrol.adaptive import ResolutionController
+
+
+class TestResolutionController(TestCase):
+
+    def test_scales_down_when_slow(self):
+        rc = ResolutionController(target_fps=10, step=0.25, patience=0,
+                                  smoothing=1)
+        self.assertEqual(rc.update(0.2), 0.75)
+        self.assertEqual(rc.update(0.2), 0.5)
+
+    def test_respects_min_scale(self):
+        rc = ResolutionController(target_fps=10, min_scale=0.5, step=0.25,
+                                  patience=0, smoothing=1)
+        for _ in range(10):
+            rc.update(1)
+        self.assertEqual(rc.scale, 0.5)
+
+    def test_scales_up_when_fast(self):
+        rc = ResolutionController(target_fps=10, step=0.25, patience=0,
+                                  smoothing=1)
+        rc.update(0.2)
+        self.assertEqual(rc.scale, 0.75)
+        self.assertEqual(rc.update(0.01), 1.0)
+        self.assertEqual(rc.update(0.01), 1.0)
+
+    def test_hysteresis_holds_scale(self):
+        rc = ResolutionController(target_fps=10, step=0.25, hysteresis=0.2,
+                                  patience=0, smoothing=1)
+        rc.update(0.2)
+        # within 20% of the 0.1s budget
+        for elapsed in [0.115, 0.085, 0.11, 0.09]:
+            self.assertEqual(rc.update(elapsed), 0.75)
+
+    def test_patience(self):
+        rc = ResolutionController(target_fps=10, step=0.25, patience=2,
+                                  smoothing=1)
+        self.assertEqual(rc.update(0.2), 1.0)
+        self.assertEqual(rc.update(0.2), 1.0)
+        self.assertEqual(rc.update(0.2), 0.75)
+        self.assertEqual(rc.update(0.2), 0.75)
+
+    def test_scale_snapped_to_step(self):
+        rc = ResolutionController(target_fps=10, min_scale=0.1, step=0.1,
+                                  patience=0, smoothing=1)
+        scales = [rc.update(1) for _ in range(9)]
+        self.assertEqual(scales, [0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.2,
+                                  0.1])
+        scales = [rc.update(0) for _ in range(3)]
+        self.assertEqual(scales, [0.2, 0.3, 0.4])
+
+    def test_invalid_target(self):
+        with self.assertRaises(ValueError):
+            ResolutionController(target_fps=0)
@@ -0,0 +1,61 @@
+from unittest import TestCase
+from unittest.mock import patch, Mock, PropertyMock
+
+from pytrackcontrol.event import EventController, BufferPool
+
+
+def allocator(shape, dtype):
+    return bytearray(sum(shape))
+
+
+class TestBufferPool(TestCase):
+
+    def test_reuse_after_release(self):
+        pool = BufferPool(allocator=allocator)
+        a = pool.acquire((2, 3))
+        b = pool.acquire((2, 3))
+        self.assertIsNot(a, b)
+        pool.release_all()
+        c = pool.acquire((2, 3))
+        self.assertTrue(c is a or c is b)
+        self.assertEqual(pool.allocations, 2)
+        self.assertEqual(pool.reuses, 1)
+
+    def test_keyed_on_shape_and_dtype(self):
+        pool = BufferPool(allocator=allocator)
+        a = pool.acquire(4)
+        pool.release_all()
+        self.assertIsNot(pool.acquire(5), a)
+        self.assertIsNot(pool.acquire(4, 'float32'), a)
+        self.assertIs(pool.acquire((4,)), a)
+
+    def test_max_free(self):
+        pool = BufferPool(max_free=1, allocator=allocator)
+        pool.acquire(4)
+        pool.acquire(4)
+        self.assertEqual(pool.leased, 2)
+        pool.release_all()
+        self.assertEqual(pool.leased, 0)
+        self.assertEqual(pool.idle, 1)
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2, 3]))
+    def test_buffers_live_for_a_frame(self):
+        buffers = []
+        e = EventController('numbers',
+                            buffer_pool=BufferPool(allocator=allocator))
+
+        @e.register('scratch')
+        def scratch(resolve, num):
+            resolve(e.buffer(8))
+
+        @e.on('scratch')
+        def scratch_handler(buf):
+            buffers.append(buf)
+            self.assertEqual(e.buffer_pool.leased, 1)
+
+        e.start()
+        self.assertEqual(e.buffer_pool.leased, 0)
+        self.assertEqual(e.buffer_pool.allocations, 1)
+        self.assertIs(buffers[0], buffers[2])
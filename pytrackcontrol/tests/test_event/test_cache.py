@@ -0,0 +1,103 @@
+from unittest import TestCase
+from unittest.mock import patch, Mock, PropertyMock
+
+from pytrackcontrol.event import EventController
+from pytrackcontrol.event.cache import ProviderCache, fingerprint
+
+
+class FakeArray:
+
+    def __init__(self, data):
+        self.shape = (len(data),)
+        self.dtype = 'uint8'
+        self._data = bytes(data)
+
+    def tobytes(self):
+        return self._data
+
+
+class TestProviderCache(TestCase):
+
+    def test_fingerprint(self):
+        self.assertEqual(fingerprint((1, 2)), fingerprint((1, 2)))
+        self.assertEqual(fingerprint(FakeArray([1, 2])),
+                         fingerprint(FakeArray([1, 2])))
+        self.assertNotEqual(fingerprint(FakeArray([1, 2])),
+                            fingerprint(FakeArray([2, 1])))
+        self.assertIsNone(fingerprint([1, set()]))
+        self.assertEqual(len(set(map(fingerprint, [1, True, 1.0]))), 3)
+        self.assertIsNone(fingerprint(object()))
+        self.assertIsNone(fingerprint((1, type('Landmarks', (), {})())))
+        self.assertIsNotNone(fingerprint(None))
+
+    def test_fingerprint_array_without_buffer_format(self):
+        array = FakeArray([1, 2])
+        with patch('pytrackcontrol.event.cache.memoryview',
+                   side_effect=ValueError, create=True):
+            self.assertEqual(fingerprint(array),
+                             fingerprint(FakeArray([1, 2])))
+
+    def test_lru_eviction(self):
+        cache = ProviderCache(maxsize=2)
+        cache.put(cache.key([1]), ['one'])
+        cache.put(cache.key([2]), ['two'])
+        cache.get(cache.key([1]))
+        cache.put(cache.key([3]), ['three'])
+        self.assertIsNone(cache.get(cache.key([2])))
+        self.assertEqual(cache.get(cache.key([1])), ['one'])
+        self.assertEqual(cache.info(), (2, 1, 2, 2))
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 1, 2, 1]))
+    def test_pure_provider_skips_repeated_inputs(self):
+        calls = []
+        outputs = []
+        e = EventController('numbers')
+
+        @e.register('squared', pure=True)
+        def squared(resolve, num):
+            calls.append(num)
+            resolve(num ** 2)
+
+        @e.on('squared')
+        def squared_handler(num):
+            outputs.append(num)
+
+        e.start()
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(outputs, [1, 1, 4, 1])
+        self.assertEqual(e.cache_info['squared'].hits, 2)
+        self.assertEqual(e.cache_info['squared'].misses, 2)
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, True, 1.0, 1]))
+    def test_pure_provider_distinguishes_types(self):
+        outputs = []
+        e = EventController('values')
+
+        @e.register('type', pure=True)
+        def type_name(resolve, value):
+            resolve(type(value).__name__)
+
+        e.on('type', outputs.append)
+        e.start()
+        self.assertEqual(outputs, ['int', 'bool', 'float', 'int'])
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 1]))
+    def test_pure_provider_caches_unresolved(self):
+        calls = []
+        e = EventController('numbers')
+
+        @e.register('even', pure=True)
+        def even(resolve, num):
+            calls.append(num)
+            if num % 2 == 0:
+                resolve(num)
+
+        e.on('even', Mock())
+        e.start()
+        self.assertEqual(calls, [1])
@@ -0,0 +1,279 @@
+from threading import Thread, Timer
+from unittest import TestCase
+from unittest.mock import patch, Mock, PropertyMock
+
+from pytrackcontrol.event import EventController
+
+
+class TestEventControllerLifecycle(TestCase):
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2, 3, 4]))
+    def test_stop(self):
+        outputs = []
+        e = EventController('root')
+
+        @e.on('root')
+        def root_handler(num):
+            outputs.append(num)
+            if num == 2:
+                e.stop()
+
+        e.start()
+        self.assertEqual(outputs, [1, 2])
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2, 3]))
+    def test_pause_resume(self):
+        outputs = []
+        paused = []
+        e = EventController('root')
+
+        @e.on('root')
+        def root_handler(num):
+            outputs.append(num)
+            if num == 1:
+                e.pause()
+                Timer(0.05, resume).start()
+
+        def resume():
+            paused.append((e.paused, list(outputs)))
+            e.resume()
+
+        e.start()
+        self.assertEqual(paused, [(True, [1])])
+        self.assertEqual(outputs, [1, 2, 3])
+        self.assertFalse(e.paused)
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2, 3]))
+    def test_stop_while_paused(self):
+        e = EventController('root')
+        e.on('root', lambda num: e.pause())
+        Timer(0.05, e.stop).start()
+
+        thread = Thread(target=e.start)
+        thread.start()
+        thread.join(timeout=1)
+        self.assertFalse(thread.is_alive())
+
+    @patch.multiple(EventController, __abstractmethods__=set())
+    def test_reload_source(self):
+        sources = iter([[1, 2, 3], [10, 20]])
+        outputs = []
+
+        with patch.object(EventController, '_context',
+                          new_callable=PropertyMock,
+                          side_effect=lambda: next(sources)):
+            e = EventController('root')
+
+            @e.on('root')
+            def root_handler(num):
+                outputs.append(num)
+                if num == 2:
+                    e.reload_source()
+
+            e.start()
+
+        self.assertEqual(outputs, [1, 2, 10, 20])
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2, 3]))
+    def test_reconfigure_while_running(self):
+        outputs = []
+        e = EventController('numbers')
+
+        @e.register('result')
+        def squared(resolve, num):
+            resolve(num ** 2)
+
+        @e.on('result')
+        def result_handler(num):
+            outputs.append(num)
+            if num == 4:
+                with e.reconfigure():
+                    e.unregister('result')
+                    e.register('result', lambda resolve, num:
+                               resolve(num ** 3))
+
+        e.start()
+        self.assertEqual(outputs, [1, 4, 27])
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2]))
+    def test_reconfigure_rollback(self):
+        outputs = []
+        e = EventController('numbers')
+
+        @e.register('squared')
+        def squared(resolve, num):
+            resolve(num ** 2)
+
+        e.on('squared', outputs.append)
+
+        with self.assertRaises(ValueError):
+            with e.reconfigure():
+                e.unregister('squared')
+                e.register('cubed', Mock(), dep='missing')
+
+        e.start()
+        self.assertEqual(outputs, [1, 4])
+
+    @patch.multiple(EventController, __abstractmethods__=set())
+    def test_unregister_with_dependants(self):
+        e = EventController('numbers')
+        e.register('squared', Mock())
+        e.register('fourth_power', Mock(), dep='squared')
+
+        with self.assertRaises(ValueError):
+            e.unregister('squared')
+        e.unregister('fourth_power')
+        e.unregister('squared')
+        with self.assertRaises(ValueError):
+            e.unregister('squared')
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2, 3]))
+    def test_reconfigure_never_mixes_graphs_within_a_frame(self):
+        outputs = []
+        e = EventController('numbers')
+
+        @e.register('a')
+        def a(resolve, num):
+            resolve(num)
+
+        @e.register('b', dep='a')
+        def old_b(resolve, num):
+            resolve(('old', num))
+
+        def new_b(resolve, num):
+            resolve(('new', num))
+
+        @e.on('a')
+        def a_handler(num):
+            if num == 2:
+                with e.reconfigure():
+                    e.unregister('b')
+                    e.register('b', new_b, dep='a')
+                    # nested blocks are applied with the outermost
+                    with e.reconfigure():
+                        e.on('b', lambda value: outputs.append('extra'))
+
+        e.on('b', outputs.append)
+
+        e.start()
+        self.assertEqual(outputs, [('old', 1), ('old', 2),
+                                   ('new', 3), 'extra'])
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2, 3]))
+    def test_reconfigure_twice_within_a_frame(self):
+        outputs = []
+        e = EventController('numbers')
+        e.register('squared', lambda resolve, num: resolve(num ** 2))
+
+        @e.on('numbers')
+        def numbers_handler(num):
+            if num == 1:
+                with e.reconfigure():
+                    e.register('cubed', lambda resolve, num:
+                               resolve(num ** 3))
+                with e.reconfigure():
+                    e.on('cubed', outputs.append)
+                self.assertNotIn('cubed', e.dag.descendants('numbers'))
+
+        e.start()
+        self.assertEqual(outputs, [8, 27])
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2, 3]))
+    def test_unregister_sibling_within_a_frame(self):
+        outputs = []
+        e = EventController('numbers')
+        e.register('a', lambda resolve, num: resolve(('a', num)))
+        e.register('b', lambda resolve, num: resolve(('b', num)))
+
+        def b_handler(value):
+            outputs.append(value)
+
+        @e.on('a')
+        def a_handler(value):
+            outputs.append(value)
+            if value == ('a', 2):
+                e.off('b', b_handler)
+                e.unregister('b')
+
+        e.on('b', b_handler)
+
+        e.start()
+        self.assertEqual(outputs, [('a', 1), ('b', 1), ('a', 2), ('b', 2),
+                                   ('a', 3)])
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2, 3]))
+    def test_direct_changes_after_reconfigure_within_a_frame(self):
+        outputs = []
+        e = EventController('numbers')
+
+        @e.on('numbers')
+        def numbers_handler(num):
+            if num == 1:
+                with e.reconfigure():
+                    e.register('squared', lambda resolve, num:
+                               resolve(num ** 2))
+                e.on('numbers', outputs.append)
+                e.on('squared', outputs.append)
+
+        e.start()
+        self.assertEqual(outputs, [2, 4, 3, 9])
+        self.assertEqual(e.handler_events, set(['numbers', 'squared']))
+
+    @patch.multiple(EventController, __abstractmethods__=set())
+    def test_register_from_another_thread(self):
+        from time import sleep
+        outputs = []
+        errors = []
+
+        def numbers():
+            n = 0
+            while True:
+                n += 1
+                sleep(0.001)
+                yield n
+
+        with patch.object(EventController, '_context',
+                          new_callable=PropertyMock,
+                          side_effect=lambda: numbers()):
+            e = EventController('numbers')
+            e.register('a', lambda resolve, num: resolve(num))
+            e.on('a', Mock())
+
+            def run():
+                try:
+                    e.start()
+                except Exception as ex:
+                    errors.append(ex)
+
+            thread = Thread(target=run)
+            thread.start()
+            for _ in range(20):
+                e.register('b', lambda resolve, num: resolve(num), dep='a')
+                e.on('b', outputs.append)
+                sleep(0.002)
+                e.off('b')
+                e.unregister('b')
+            e.stop()
+            thread.join(timeout=1)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(errors, [])
+        self.assertTrue(outputs)
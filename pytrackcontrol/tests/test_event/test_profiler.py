@@ -0,0 +1,67 @@
+import io
+import json
+from unittest import TestCase
+from unittest.mock import patch, Mock, PropertyMock
+
+from pytrackcontrol.event import EventController, Profiler
+
+
+class TestProfiler(TestCase):
+
+    def test_ring_buffer_capacity(self):
+        profiler = Profiler(capacity=2)
+        profiler.record('a', 0, 0.0, 1.0)
+        profiler.record('b', 0, 1.0, 2.0)
+        profiler.record('c', 1, 2.0, 3.0)
+        names = [e['name'] for e in profiler.trace_events()]
+        self.assertEqual(names, ['b', 'c'])
+
+    def test_dump_chrome_trace(self):
+        profiler = Profiler()
+        profiler.record('a', 0, 1.0, 1.5)
+        profiler.record('b', 1, 2.0, 2.25)
+        f = io.StringIO()
+        profiler.dump(f, frames=[1])
+        trace = json.loads(f.getvalue())
+        self.assertEqual(len(trace['traceEvents']), 1)
+        event = trace['traceEvents'][0]
+        self.assertEqual(event['name'], 'b')
+        self.assertEqual(event['ph'], 'X')
+        self.assertEqual(event['dur'], 0.25e6)
+        self.assertEqual(event['args'], {'frame': 1})
+
+    def test_slow_frame_trigger(self):
+        on_slow_frame = Mock()
+        profiler = Profiler(slow_frame=0.5, on_slow_frame=on_slow_frame)
+        profiler.record_frame(0, 0.0, 0.1)
+        profiler.record_frame(1, 1.0, 2.0)
+        on_slow_frame.assert_called_once_with(profiler, 1, 1.0)
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2, 3]))
+    def test_event_controller_records_frames(self):
+        profiler = Profiler()
+        e = EventController('numbers', profiler=profiler)
+
+        @e.register('squared')
+        def squared(resolve, num):
+            resolve(num ** 2)
+
+        @e.on('squared')
+        def squared_handler(num):
+            pass
+
+        e.start()
+        events = [(t['name'], t['args']['frame'])
+                  for t in profiler.trace_events()]
+        self.assertEqual(events, [('squared', 0), ('frame', 0),
+                                  ('squared', 1), ('frame', 1),
+                                  ('squared', 2), ('frame', 2)])
+
+    def test_provider_named_frame(self):
+        profiler = Profiler()
+        profiler.record('frame', 0, 0.0, 0.5)
+        profiler.record_frame(0, 0.0, 1.0)
+        categories = [e['cat'] for e in profiler.trace_events()]
+        self.assertEqual(categories, ['provider', 'frame'])
@@ -1,7 +1,9 @@
 from unittest import TestCase
 from unittest.mock import patch, Mock, PropertyMock
 
+from pytrackcontrol.adaptive import ResolutionController
 from pytrackcontrol.event import EventController
+from pytrackcontrol.track_event_controller import TrackEventController
 
 
 class TestEventController(TestCase):
@@ -266,3 +268,180 @@ class TestEventController(TestCase):
             @e.register('a', dep=['root', 'b'])
             def a(resolve, num):
                 pass
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2, 3]))
+    def test_critical_path_measures_provider_costs(self):
+        e = EventController('numbers')
+
+        @e.register('squared')
+        def squared(resolve, num):
+            resolve(num ** 2)
+
+        @e.register('cubed')
+        def cubed(resolve, num):
+            resolve(num ** 3)
+
+        @e.on('squared')
+        def squared_handler(num):
+            pass
+
+        e.start()
+        self.assertEqual(set(e.provider_costs), set(['squared']))
+        path, cost = e.critical_path()
+        self.assertEqual(path, ['numbers', 'squared'])
+        self.assertEqual(cost, e.provider_costs['squared'])
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2, 3]))
+    def test_reorder_by_measured_cost(self):
+        from time import sleep
+        calls = []
+        e = EventController('numbers', reorder_interval=1)
+
+        @e.register('cheap')
+        def cheap(resolve, num):
+            calls.append(('cheap', num))
+            resolve(num)
+
+        @e.register('costly')
+        def costly(resolve, num):
+            calls.append(('costly', num))
+            sleep(0.01)
+            resolve(num)
+
+        e.on('cheap', Mock())
+        e.on('costly', Mock())
+
+        e.start()
+        self.assertEqual(calls, [('cheap', 1), ('costly', 1),
+                                 ('costly', 2), ('cheap', 2),
+                                 ('costly', 3), ('cheap', 3)])
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2]))
+    def test_provider_costs_exclude_handlers(self):
+        from time import sleep
+        e = EventController('numbers')
+
+        @e.register('squared')
+        def squared(resolve, num):
+            resolve(num ** 2)
+
+        e.on('squared', lambda num: sleep(0.02))
+
+        e.start()
+        self.assertLess(e.provider_costs['squared'], 0.01)
+
+
+class TestTrackEventController(TestCase):
+
+    def frames(self, n):
+        import numpy as np
+        return [np.zeros((100, 200, 3), dtype=np.uint8) for _ in range(n)]
+
+    @patch.multiple(TrackEventController, _context=PropertyMock())
+    def test_scale_is_not_reserved_without_target_fps(self):
+        e = TrackEventController()
+        e.register('scale', Mock())
+
+    @patch.multiple(TrackEventController, _context=PropertyMock())
+    def test_scale_is_reserved_with_target_fps(self):
+        e = TrackEventController(target_fps=30)
+        with self.assertRaises(ValueError):
+            e.register('scale', Mock())
+
+    def test_adaptive_resolution(self):
+        outputs = []
+        # every frame misses the budget, so the scale drops each frame
+        resolution = ResolutionController(target_fps=1e9, min_scale=0.25,
+                                          step=0.25, patience=0, smoothing=1)
+
+        with patch.object(TrackEventController, '_context',
+                          new_callable=PropertyMock,
+                          return_value=self.frames(5)):
+            e = TrackEventController(resolution=resolution)
+
+            @e.register('shape', dep=['src', 'scale'])
+            def shape(resolve, img, scale):
+                resolve((img.shape, scale))
+
+            e.on('shape', outputs.append)
+            e.start()
+
+        self.assertEqual(outputs, [((100, 200, 3), (1.0, 1.0)),
+                                   ((75, 150, 3), (0.75, 0.75)),
+                                   ((50, 100, 3), (0.5, 0.5)),
+                                   ((25, 50, 3), (0.25, 0.25)),
+                                   ((25, 50, 3), (0.25, 0.25))])
+
+    def test_adaptive_resolution_publishes_actual_ratios(self):
+        import numpy as np
+        outputs = []
+        resolution = ResolutionController(target_fps=1e9, min_scale=0.5,
+                                          step=0.5, patience=0, smoothing=1)
+        frames = [np.zeros((33, 70), dtype=np.uint8) for _ in range(2)]
+
+        with patch.object(TrackEventController, '_context',
+                          new_callable=PropertyMock, return_value=frames):
+            e = TrackEventController(resolution=resolution)
+
+            @e.register('shape', dep=['src', 'scale'])
+            def shape(resolve, img, scale):
+                resolve((img.shape, scale))
+
+            e.on('shape', outputs.append)
+            e.start()
+
+        (h, w), (sx, sy) = outputs[1]
+        self.assertEqual((sx, sy), (w / 70, h / 33))
+        self.assertNotEqual(sx, sy)
+
+    def test_adaptive_resolution_bbox_in_original_coordinates(self):
+        from pytrackcontrol.providers import FaceBBoxProvider
+        outputs = []
+        resolution = ResolutionController(target_fps=1e9, min_scale=0.5,
+                                          step=0.5, patience=0, smoothing=1)
+
+        with patch('pytrackcontrol.providers.FaceTracker') as tracker, \
+             patch.object(TrackEventController, '_context',
+                          new_callable=PropertyMock,
+                          return_value=self.frames(2)):
+            # a face at (50, 20, 40, 40) in the original frame
+            tracker.return_value.track.side_effect = \
+                lambda img: tuple(int(c * img.shape[0] / 100)
+                                  for c in (50, 20, 40, 40))
+            e = TrackEventController(resolution=resolution)
+            e.register('face', FaceBBoxProvider().provide,
+                       dep=['src', 'scale'])
+            e.on('face', outputs.append)
+            e.start()
+
+        self.assertEqual(outputs, [(50, 20, 40, 40), (50, 20, 40, 40)])
+
+    @patch.multiple(EventController,
+                    __abstractmethods__=set(),
+                    _context=PropertyMock(return_value=[1, 2]))
+    def test_registration_order_kept_by_default(self):
+        from time import sleep
+        calls = []
+        e = EventController('numbers')
+
+        @e.register('cheap')
+        def cheap(resolve, num):
+            calls.append('cheap')
+
+        @e.register('costly')
+        def costly(resolve, num):
+            calls.append('costly')
+            sleep(0.01)
+
+        e.on('cheap', Mock())
+        e.on('costly', Mock())
+
+        e.start()
+        e.start()
+        self.assertEqual(calls, ['cheap', 'costly'] * 4)
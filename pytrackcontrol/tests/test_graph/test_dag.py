@@ -63,3 +63,94 @@ class TestDag(TestCase):
         self.assertEqual(set(result[:2]), set(['parent1', 'parent2']))
         self.assertEqual(set(result[2:5]), set(['child1', 'child2', 'child3']))
         self.assertEqual(set(result[5:]), set(['grandchild1', 'grandchild2']))
+
+    def test_weighted_topological_sort(self):
+        dag = Dag('root')
+        dag.add_edge('root', 'cheap')
+        dag.add_edge('root', 'costly')
+        dag.add_edge('costly', 'costly_child')
+        weights = {'cheap': 1, 'costly': 5, 'costly_child': 5}
+        result = dag.topological_sort(weights=weights)
+        self.assertEqual(result, ['root', 'costly', 'costly_child', 'cheap'])
+
+    def test_levels(self):
+        dag = Dag()
+        dag.add_edge('parent', 'child1')
+        dag.add_edge('parent', 'child2')
+        dag.add_edge('child1', 'grandchild')
+        dag.add_edge('parent', 'grandchild')
+        result = dag.levels()
+        self.assertEqual(result[0], ['parent'])
+        self.assertEqual(set(result[1]), set(['child1', 'child2']))
+        self.assertEqual(result[2], ['grandchild'])
+
+    def test_critical_path(self):
+        dag = Dag()
+        dag.add_edge('parent', 'child1')
+        dag.add_edge('parent', 'child2')
+        dag.add_edge('child1', 'grandchild')
+        dag.add_edge('child2', 'grandchild')
+        weights = {'parent': 1, 'child1': 2, 'child2': 7, 'grandchild': 1}
+        path, cost = dag.critical_path(weights)
+        self.assertEqual(path, ['parent', 'child2', 'grandchild'])
+        self.assertEqual(cost, 9)
+
+    def test_critical_path_unweighted(self):
+        dag = Dag()
+        dag.add_edge('parent', 'child1')
+        dag.add_edge('parent', 'child2')
+        dag.add_edge('child2', 'grandchild')
+        path, cost = dag.critical_path()
+        self.assertEqual(path, ['parent', 'child2', 'grandchild'])
+        self.assertEqual(cost, 3)
+
+    def test_ancestors_descendants(self):
+        dag = Dag()
+        dag.add_edge('parent', 'child1')
+        dag.add_edge('parent', 'child2')
+        dag.add_edge('child1', 'grandchild')
+        self.assertEqual(dag.ancestors('grandchild'),
+                         set(['parent', 'child1']))
+        self.assertEqual(dag.descendants('parent'),
+                         set(['child1', 'child2', 'grandchild']))
+        self.assertEqual(dag.descendants('child2'), set())
+        with self.assertRaises(ValueError):
+            dag.ancestors('missing')
+
+    def test_transitive_reduction(self):
+        dag = Dag()
+        dag.add_edge('parent', 'child')
+        dag.add_edge('child', 'grandchild')
+        dag.add_edge('parent', 'grandchild')
+        reduced = dag.transitive_reduction()
+        self.assertEqual(reduced.descendants('parent'),
+                         set(['child', 'grandchild']))
+        self.assertNotIn('"parent" -> "grandchild"', reduced.to_dot())
+        self.assertIn('"parent" -> "grandchild"', dag.to_dot())
+
+    def test_to_dot(self):
+        dag = Dag()
+        dag.add_edge('parent', 'child1')
+        dag.add_edge('parent', 'child2')
+        result = dag.to_dot(weights={'parent': 1, 'child1': 2, 'child2': 3})
+        self.assertTrue(result.startswith('digraph "dag" {'))
+        self.assertIn('"parent" -> "child2" [color=red, penwidth=2];', result)
+        self.assertIn('"parent" -> "child1";', result)
+
+    def test_remove_vertex(self):
+        dag = Dag('root')
+        dag.add_edge('root', 'child1')
+        dag.add_edge('root', 'child2')
+        dag.add_edge('child1', 'grandchild')
+        dag.remove_vertex('grandchild')
+        dag.remove_vertex('child2')
+        self.assertEqual(dag.topological_sort(), ['root', 'child1'])
+        with self.assertRaises(ValueError):
+            dag.remove_vertex('root')
+
+    def test_to_dot_escapes_names(self):
+        dag = Dag()
+        dag.add_edge('say "hi"', 'back\\slash')
+        result = dag.to_dot(weights={'say "hi"': 1})
+        self.assertIn('"say \\"hi\\"" -> "back\\\\slash"', result)
+        self.assertIn('[label="say \\"hi\\"\\n1"]', result)
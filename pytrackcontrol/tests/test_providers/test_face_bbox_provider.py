@@ -0,0 +1,35 @@
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+from pytrackcontrol.providers import FaceBBoxProvider
+
+
+class TestFaceBBoxProvider(TestCase):
+
+    @patch('pytrackcontrol.providers.FaceTracker')
+    def test_bbox_mapped_back_with_scale(self, tracker):
+        tracker.return_value.track.return_value = (10, 20, 30, 40)
+        resolve = Mock()
+        FaceBBoxProvider().provide(resolve, 'img', (0.5, 0.5))
+        resolve.assert_called_once_with((20, 40, 60, 80))
+
+    @patch('pytrackcontrol.providers.FaceTracker')
+    def test_bbox_mapped_back_with_xy_ratios(self, tracker):
+        tracker.return_value.track.return_value = (10, 20, 30, 40)
+        resolve = Mock()
+        FaceBBoxProvider().provide(resolve, 'img', (0.5, 0.25))
+        resolve.assert_called_once_with((20, 80, 60, 160))
+
+    @patch('pytrackcontrol.providers.FaceTracker')
+    def test_bbox_unscaled(self, tracker):
+        tracker.return_value.track.return_value = (10, 20, 30, 40)
+        resolve = Mock()
+        FaceBBoxProvider().provide(resolve, 'img')
+        resolve.assert_called_once_with((10, 20, 30, 40))
+
+    @patch('pytrackcontrol.providers.FaceTracker')
+    def test_no_face(self, tracker):
+        tracker.return_value.track.return_value = None
+        resolve = Mock()
+        FaceBBoxProvider().provide(resolve, 'img', (0.5, 0.5))
+        resolve.assert_not_called()
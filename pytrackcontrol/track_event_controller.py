@@ -1,15 +1,111 @@
+from time import perf_counter
+
+from pytrackcontrol.adaptive import ResolutionController
 from pytrackcontrol.event import EventController
 from pytrackvision.utils.camera_stream import get_camera_stream
 
 
 class TrackEventController(EventController):
+    """Dispatches camera frames as the 'src' event.
+
+    In adaptive resolution mode (`target_fps` or `resolution` given) a
+    'scale' event is also provided, resolving the (x, y) ratios of the
+    current frame's size to the camera resolution, so 'scale' cannot be
+    registered by other providers in that mode. Adaptive resolution
+    requires OpenCV (cv2).
+
+    Downscaled 'src' frames are pooled buffers (see `buffer`) which are
+    overwritten by later frames once the current frame has been
+    dispatched. Handlers and providers that keep a frame, or a view of it,
+    beyond the frame (e.g. display queues or other threads) must copy it.
+    """
 
-    def __init__(self, src=None, **kwargs):
+    def __init__(self, src=None, framerate=30, target_fps=None,
+                 resolution=None, **kwargs):
         """
+
+        Parameters
+        ----------
+        src: int or str, optional
+            The camera or video source
+        framerate: int, optional
+            The frame rate requested from the camera
+        target_fps: float, optional
+            Enables adaptive resolution: frames are downscaled before being
+            dispatched so that processing holds this frame rate. Providers
+            can depend on the 'scale' event to map their outputs back to
+            the original resolution. The 'src' frames are then only valid
+            until the frame has been dispatched.
+        resolution: ResolutionController, optional
+            Enables adaptive resolution with custom tuning, overrides
+            `target_fps`
         """
         EventController.__init__(self, root_event_label='src', **kwargs)
         self._src = src
+        self._framerate = framerate
+        self._resolution = resolution
+        if self._resolution is None and target_fps:
+            self._resolution = ResolutionController(target_fps)
+        self._scale = (1.0, 1.0)
+
+        if self._resolution is not None:
+            @self.register('scale')
+            def scale(resolve, img):
+                resolve(self._scale)
+
+    @property
+    def scale(self):
+        """
+        Returns
+        -------
+        tuple[float, float]
+            the (x, y) ratios of the size of the frame currently being
+            dispatched to the camera resolution
+        """
+        return self._scale
+
+    def set_source(self, src=None, framerate=None):
+        """Switch to another camera or video source.
+
+        If running, the current source is closed and the new one opened
+        between frames, keeping the registered providers (and their models)
+        loaded.
+
+        Parameters
+        ----------
+        src: int or str, optional
+            The camera or video source
+        framerate: int, optional
+            The frame rate requested from the camera, unchanged by default
+        """
+        self._src = src
+        if framerate:
+            self._framerate = framerate
+        self.reload_source()
+
+    def _dispatch(self, value):
+        if self._resolution is None:
+            return EventController._dispatch(self, value)
+
+        scale = self._resolution.scale
+        if scale == 1.0:
+            self._scale = (1.0, 1.0)
+        else:
+            import cv2
+
+            h, w = value.shape[:2]
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            # the ratios actually used after rounding to whole pixels
+            self._scale = (size[0] / w, size[1] / h)
+            dst = self.buffer(size[::-1] + value.shape[2:], value.dtype)
+            value = cv2.resize(value, size, dst=dst,
+                               interpolation=cv2.INTER_AREA)
+
+        t = perf_counter()
+        EventController._dispatch(self, value)
+        self._resolution.update(perf_counter() - t)
 
     @property
     def _context(self):
-        return get_camera_stream(multi_thread=True, framerate=30, src=self._src)
+        return get_camera_stream(multi_thread=True, framerate=self._framerate,
+                                 src=self._src)